@@ -1,228 +1,264 @@
 """Temporal activities for game logic."""
-import random
-import copy
 from datetime import datetime
+import numpy as np
 from temporalio import activity
-from typing import List
-from src.types import Cell, GameBoard, GameConfig, GameState, GameStatus
+from src.types import GameBoard, GameConfig, GameState, GameStatus, MoveBatch, MoveResult
+from src.cascade import NEIGHBOR_OFFSETS, reveal_cascade
 
 
-def count_neighbor_mines(cells: List[List[Cell]], row: int, col: int, width: int, height: int) -> int:
-    """Count the number of mines in neighboring cells."""
-    count = 0
-    for dr in [-1, 0, 1]:
-        for dc in [-1, 0, 1]:
-            if dr == 0 and dc == 0:
-                continue
-            new_row = row + dr
-            new_col = col + dc
-            if 0 <= new_row < height and 0 <= new_col < width:
-                if cells[new_row][new_col].is_mine:
-                    count += 1
-    return count
+class InvalidMoveError(Exception):
+    """Raised for moves or configs that can never be applied, such as cells off the board."""
+
+
+def check_in_bounds(board: GameBoard, row: int, col: int) -> None:
+    """Raise InvalidMoveError if a cell is off the board."""
+    if not (0 <= row < board.height and 0 <= col < board.width):
+        raise InvalidMoveError(f"Cell ({row}, {col}) is outside the {board.height}x{board.width} board")
+
+
+def count_neighbor_mines(is_mine: np.ndarray) -> np.ndarray:
+    """Count the number of mines in the neighboring cells of every cell."""
+    # Sum the eight shifted views of the zero-padded mine grid
+    padded = np.pad(is_mine.astype(np.int8), 1)
+    return (
+        padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] +
+        padded[1:-1, :-2] + padded[1:-1, 2:] +
+        padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:]
+    )
+
+
+def board_neighbor_mines(is_mine: np.ndarray) -> np.ndarray:
+    """Neighbor counts as stored on the board: read-only, with mine cells at 0."""
+    neighbor_mines = count_neighbor_mines(is_mine)
+    neighbor_mines[is_mine == 1] = 0
+    neighbor_mines.flags.writeable = False
+    return neighbor_mines
+
+
+def clone_game_state(game_state: GameState) -> GameState:
+    """Copy a game state, duplicating only the mutable board arrays."""
+    board = game_state.board
+    # Mine layout and neighbor counts never change after the board is created,
+    # so they are shared rather than copied
+    return GameState(
+        id=game_state.id,
+        board=GameBoard(
+            is_mine=board.is_mine,
+            is_revealed=board.is_revealed.copy(),
+            is_flagged=board.is_flagged.copy(),
+            neighbor_mines=board.neighbor_mines,
+            width=board.width,
+            height=board.height,
+            mine_count=board.mine_count
+        ),
+        status=game_state.status,
+        start_time=game_state.start_time,
+        end_time=game_state.end_time,
+        flags_used=game_state.flags_used,
+        cells_revealed=game_state.cells_revealed
+    )
+
+
+def move_result(game_state: GameState, new_game_state: GameState) -> MoveResult:
+    """Describe the changes a move made between two states of the same game."""
+    old_board, new_board = game_state.board, new_game_state.board
+    revealed = np.argwhere(new_board.is_revealed > old_board.is_revealed).tolist()
+    flagged = np.argwhere(new_board.is_flagged > old_board.is_flagged).tolist()
+    unflagged = np.argwhere(new_board.is_flagged < old_board.is_flagged).tolist()
+    return MoveResult(
+        revealed=[(row, col) for row, col in revealed],
+        flagged=[(row, col) for row, col in flagged],
+        unflagged=[(row, col) for row, col in unflagged],
+        status=new_game_state.status,
+        cells_revealed=new_game_state.cells_revealed,
+        flags_used=new_game_state.flags_used,
+        start_time=new_game_state.start_time,
+        end_time=new_game_state.end_time
+    )
+
+
+def unchanged_move_result(game_state: GameState) -> MoveResult:
+    """Result of a move that did not change the game state."""
+    return MoveResult(
+        revealed=[],
+        flagged=[],
+        unflagged=[],
+        status=game_state.status,
+        cells_revealed=game_state.cells_revealed,
+        flags_used=game_state.flags_used,
+        start_time=game_state.start_time,
+        end_time=game_state.end_time,
+        base_version=game_state.version,
+        version=game_state.version
+    )
+
+
+def end_game(game_state: GameState, status: GameStatus) -> None:
+    """Mark the game as finished, stamping the end time with the final status."""
+    game_state.status = status
+    game_state.end_time = datetime.utcnow()
 
 
 @activity.defn
 async def create_game_board(config: GameConfig) -> GameBoard:
     """Create a new game board with randomly placed mines."""
+    if not config.has_valid_seed():
+        raise InvalidMoveError(f"Invalid board seed {config.seed!r}, expected a non-negative integer")
     width, height, mine_count = config.width, config.height, config.mine_count
 
-    # Initialize empty board
-    cells: List[List[Cell]] = []
-    for row in range(height):
-        cells.append([])
-        for col in range(width):
-            cells[row].append(Cell(
-                is_mine=False,
-                is_revealed=False,
-                is_flagged=False,
-                neighbor_mines=0,
-                row=row,
-                col=col
-            ))
-
-    # Place mines randomly using Fisher-Yates shuffle
-    positions = [(row, col) for row in range(height) for col in range(width)]
-    random.shuffle(positions)
-
-    # Place mines
-    for i in range(min(mine_count, len(positions))):
-        row, col = positions[i]
-        cells[row][col].is_mine = True
-
-    # Calculate neighbor mine counts
-    for row in range(height):
-        for col in range(width):
-            if not cells[row][col].is_mine:
-                cells[row][col].neighbor_mines = count_neighbor_mines(cells, row, col, width, height)
+    # Place mines at randomly sampled distinct positions
+    rng = np.random.default_rng(config.seed)
+    mine_positions = rng.choice(width * height, size=min(mine_count, width * height), replace=False)
+    is_mine = np.zeros(width * height, dtype=np.uint8)
+    is_mine[mine_positions] = 1
+    is_mine = is_mine.reshape(height, width)
+
+    # Calculate neighbor mine counts (mine cells keep a count of 0)
+    neighbor_mines = board_neighbor_mines(is_mine)
+    is_mine.flags.writeable = False
 
     return GameBoard(
-        cells=cells,
+        is_mine=is_mine,
+        is_revealed=np.zeros((height, width), dtype=np.uint8),
+        is_flagged=np.zeros((height, width), dtype=np.uint8),
+        neighbor_mines=neighbor_mines,
         width=width,
         height=height,
         mine_count=mine_count
     )
 
 
-def reveal_cell_recursive(cells: List[List[Cell]], row: int, col: int, width: int, height: int) -> None:
-    """Recursively reveal cells (cascade logic)."""
-    if row < 0 or row >= height or col < 0 or col >= width:
-        return
+def reveal_cell_cascade(board: GameBoard, row: int, col: int, stack: np.ndarray) -> int:
+    """Reveal a cell and cascade to neighbors; returns the number of cells revealed."""
+    return reveal_cascade(board.is_revealed, board.is_mine, board.is_flagged, board.neighbor_mines,
+                          row, col, board.height, board.width, stack)
 
-    cell = cells[row][col]
-    if cell.is_revealed or cell.is_flagged or cell.is_mine:
-        return
-
-    cell.is_revealed = True
-
-    # If this cell has no neighboring mines, reveal all neighbors
-    if cell.neighbor_mines == 0:
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                reveal_cell_recursive(cells, row + dr, col + dc, width, height)
 
+def reveal_in_place(game_state: GameState, row: int, col: int) -> None:
+    """Reveal a cell and potentially cascade to neighbors, mutating the state."""
+    board = game_state.board
+    check_in_bounds(board, row, col)
 
-@activity.defn
-async def reveal_cell(game_state: GameState, row: int, col: int) -> GameState:
-    """Reveal a cell and potentially cascade to neighbors."""
-    cell = game_state.board.cells[row][col]
-
-    if cell.is_revealed or cell.is_flagged:
-        return game_state
-
-    # Deep clone the game state
-    new_game_state = copy.deepcopy(game_state)
+    if board.is_revealed[row, col] or board.is_flagged[row, col]:
+        return
 
-    if cell.is_mine:
+    if board.is_mine[row, col]:
         # Game over
-        new_game_state.status = GameStatus.LOST
-        new_game_state.end_time = datetime.utcnow()
+        end_game(game_state, GameStatus.LOST)
         # Reveal all mines
-        for r in range(new_game_state.board.height):
-            for c in range(new_game_state.board.width):
-                if new_game_state.board.cells[r][c].is_mine:
-                    new_game_state.board.cells[r][c].is_revealed = True
+        board.is_revealed |= board.is_mine
     else:
         # Reveal the cell and potentially cascade
-        reveal_cell_recursive(new_game_state.board.cells, row, col,
-                            new_game_state.board.width, new_game_state.board.height)
-
-        # Count revealed cells
-        revealed_count = 0
-        for r in range(new_game_state.board.height):
-            for c in range(new_game_state.board.width):
-                if new_game_state.board.cells[r][c].is_revealed:
-                    revealed_count += 1
-
-        new_game_state.cells_revealed = revealed_count
+        stack = np.empty(board.height * board.width, dtype=np.int32)
+        game_state.cells_revealed += reveal_cell_cascade(board, row, col, stack)
 
         # Check win condition
-        total_cells = new_game_state.board.width * new_game_state.board.height
-        if revealed_count == total_cells - new_game_state.board.mine_count:
-            new_game_state.status = GameStatus.WON
-            new_game_state.end_time = datetime.utcnow()
-
-    return new_game_state
+        total_cells = board.width * board.height
+        if game_state.cells_revealed == total_cells - board.mine_count:
+            end_game(game_state, GameStatus.WON)
 
 
-@activity.defn
-async def toggle_flag(game_state: GameState, row: int, col: int) -> GameState:
-    """Toggle flag on a cell."""
-    cell = game_state.board.cells[row][col]
+def toggle_flag_in_place(game_state: GameState, row: int, col: int) -> None:
+    """Toggle flag on a cell, mutating the state."""
+    board = game_state.board
+    check_in_bounds(board, row, col)
 
-    if cell.is_revealed:
-        return game_state
-
-    # Deep clone the game state
-    new_game_state = copy.deepcopy(game_state)
-    new_cell = new_game_state.board.cells[row][col]
-
-    new_cell.is_flagged = not new_cell.is_flagged
-
-    # Update flag count
-    flag_count = 0
-    for r in range(new_game_state.board.height):
-        for c in range(new_game_state.board.width):
-            if new_game_state.board.cells[r][c].is_flagged:
-                flag_count += 1
-
-    new_game_state.flags_used = flag_count
+    if board.is_revealed[row, col]:
+        return
 
-    return new_game_state
+    was_flagged = board.is_flagged[row, col]
+    board.is_flagged[row, col] = 0 if was_flagged else 1
+    game_state.flags_used += -1 if was_flagged else 1
 
 
-@activity.defn
-async def chord_reveal(game_state: GameState, row: int, col: int) -> GameState:
-    """Mass open adjacent cells when flags match the cell's number."""
-    cell = game_state.board.cells[row][col]
+def chord_reveal_in_place(game_state: GameState, row: int, col: int) -> None:
+    """Mass open adjacent cells when flags match the cell's number, mutating the state."""
+    board = game_state.board
+    check_in_bounds(board, row, col)
+    cell = board.cell(row, col)
 
     # Can only chord on revealed cells with numbers
     if not cell.is_revealed or cell.is_mine or cell.neighbor_mines == 0:
-        return game_state
-
-    # Deep clone the game state
-    new_game_state = copy.deepcopy(game_state)
+        return
 
     # Count flagged neighbors and collect unflagged, unrevealed neighbors
     flagged_count = 0
     neighbors_to_reveal = []
 
-    for dr in [-1, 0, 1]:
-        for dc in [-1, 0, 1]:
-            if dr == 0 and dc == 0:
-                continue
+    for dr, dc in NEIGHBOR_OFFSETS:
+        new_row = row + dr
+        new_col = col + dc
 
-            new_row = row + dr
-            new_col = col + dc
-
-            if 0 <= new_row < game_state.board.height and 0 <= new_col < game_state.board.width:
-                neighbor = game_state.board.cells[new_row][new_col]
-
-                if neighbor.is_flagged:
-                    flagged_count += 1
-                elif not neighbor.is_revealed:
-                    neighbors_to_reveal.append((new_row, new_col))
+        if 0 <= new_row < board.height and 0 <= new_col < board.width:
+            if board.is_flagged[new_row, new_col]:
+                flagged_count += 1
+            elif not board.is_revealed[new_row, new_col]:
+                neighbors_to_reveal.append((new_row, new_col))
 
     # Only proceed if flagged count matches the cell's number
     if flagged_count != cell.neighbor_mines:
-        return game_state
+        return
 
     # Reveal all unflagged neighbors
     hit_mine = False
+    revealed_count = 0
+    stack = np.empty(board.height * board.width, dtype=np.int32)
     for neighbor_row, neighbor_col in neighbors_to_reveal:
-        neighbor_cell = new_game_state.board.cells[neighbor_row][neighbor_col]
-
-        if neighbor_cell.is_mine:
+        if board.is_mine[neighbor_row, neighbor_col]:
             hit_mine = True
-            neighbor_cell.is_revealed = True
+            board.is_revealed[neighbor_row, neighbor_col] = 1
         else:
-            # Use recursive reveal for empty cells
-            reveal_cell_recursive(new_game_state.board.cells, neighbor_row, neighbor_col,
-                                new_game_state.board.width, new_game_state.board.height)
+            # Use cascade reveal for empty cells
+            revealed_count += reveal_cell_cascade(board, neighbor_row, neighbor_col, stack)
 
     if hit_mine:
         # Game over - reveal all mines
-        new_game_state.status = GameStatus.LOST
-        new_game_state.end_time = datetime.utcnow()
-        for r in range(new_game_state.board.height):
-            for c in range(new_game_state.board.width):
-                if new_game_state.board.cells[r][c].is_mine:
-                    new_game_state.board.cells[r][c].is_revealed = True
+        end_game(game_state, GameStatus.LOST)
+        board.is_revealed |= board.is_mine
     else:
-        # Count revealed cells and check win condition
-        revealed_count = 0
-        for r in range(new_game_state.board.height):
-            for c in range(new_game_state.board.width):
-                if new_game_state.board.cells[r][c].is_revealed:
-                    revealed_count += 1
+        # Update revealed count and check win condition
+        game_state.cells_revealed += revealed_count
+
+        total_cells = board.width * board.height
+        if game_state.cells_revealed == total_cells - board.mine_count:
+            end_game(game_state, GameStatus.WON)
+
 
-        new_game_state.cells_revealed = revealed_count
+# In-place handler for each move action, indexed by MoveAction
+MOVE_HANDLERS = (
+    reveal_in_place,         # MoveAction.REVEAL
+    toggle_flag_in_place,    # MoveAction.FLAG
+    toggle_flag_in_place,    # MoveAction.UNFLAG
+    chord_reveal_in_place,   # MoveAction.CHORD
+)
 
-        total_cells = new_game_state.board.width * new_game_state.board.height
-        if revealed_count == total_cells - new_game_state.board.mine_count:
-            new_game_state.status = GameStatus.WON
-            new_game_state.end_time = datetime.utcnow()
 
-    return new_game_state
+@activity.defn
+async def apply_moves_batch(batch: MoveBatch) -> MoveResult:
+    """Apply a batch of moves in order and return their combined changes."""
+    height, width = batch.is_mine.shape
+    # The decoded arrays belong to this activity; the compiled cascade takes these two read-only
+    batch.is_mine.flags.writeable = False
+    batch.neighbor_mines.flags.writeable = False
+    game_state = GameState(
+        id="",
+        board=GameBoard(
+            is_mine=batch.is_mine,
+            is_revealed=batch.is_revealed,
+            is_flagged=batch.is_flagged,
+            neighbor_mines=batch.neighbor_mines,
+            width=width,
+            height=height,
+            mine_count=batch.mine_count
+        ),
+        status=batch.status,
+        start_time=batch.start_time,
+        flags_used=batch.flags_used,
+        cells_revealed=batch.cells_revealed
+    )
+    new_game_state = clone_game_state(game_state)
+    for move in batch.moves:
+        if new_game_state.status != GameStatus.IN_PROGRESS:
+            break  # Remaining moves of a finished game are ignored
+        MOVE_HANDLERS[move.action](new_game_state, move.row, move.col)
+    return move_result(game_state, new_game_state)
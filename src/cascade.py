@@ -0,0 +1,83 @@
+"""Compiled cascade (flood-fill) reveal for the game board."""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is unavailable on some platforms
+    njit = None
+
+# (row, col) offsets of the eight neighbors of a cell
+NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def reveal_cascade_py(is_revealed: np.ndarray, is_mine: np.ndarray, is_flagged: np.ndarray,
+                      neighbor_mines: np.ndarray, row: int, col: int, height: int, width: int,
+                      stack: np.ndarray) -> int:
+    """Pure Python fallback for the compiled cascade; ``stack`` is unused."""
+    revealed = 0
+    pending = [(row, col)]
+    while pending:
+        r, c = pending.pop()
+        if r < 0 or r >= height or c < 0 or c >= width:
+            continue
+        if is_revealed[r, c] or is_flagged[r, c] or is_mine[r, c]:
+            continue
+
+        is_revealed[r, c] = 1
+        revealed += 1
+
+        # If this cell has no neighboring mines, reveal all neighbors
+        if neighbor_mines[r, c] == 0:
+            pending.extend((r + dr, c + dc) for dr, dc in NEIGHBOR_OFFSETS)
+
+    return revealed
+
+
+def _reveal_cascade_kernel(is_revealed: np.ndarray, is_mine: np.ndarray, is_flagged: np.ndarray,
+                           neighbor_mines: np.ndarray, row: int, col: int, height: int, width: int,
+                           stack: np.ndarray) -> int:
+    """Reveal a cell and flood-fill outwards through cells with no neighboring mines.
+
+    ``stack`` must be a preallocated int32 array of at least ``height * width``
+    entries; cells are marked revealed when pushed, so each is pushed at most once.
+    Returns the number of newly revealed cells.
+    """
+    if row < 0 or row >= height or col < 0 or col >= width:
+        return 0
+    if is_revealed[row, col] or is_flagged[row, col] or is_mine[row, col]:
+        return 0
+
+    is_revealed[row, col] = 1
+    stack[0] = row * width + col
+    top = 1
+    revealed = 1
+
+    while top > 0:
+        top -= 1
+        r = stack[top] // width
+        c = stack[top] % width
+
+        # If this cell has no neighboring mines, reveal all neighbors
+        if neighbor_mines[r, c] != 0:
+            continue
+        for dr, dc in NEIGHBOR_OFFSETS:
+            new_row = r + dr
+            new_col = c + dc
+            if new_row < 0 or new_row >= height or new_col < 0 or new_col >= width:
+                continue
+            if is_revealed[new_row, new_col] or is_flagged[new_row, new_col] or is_mine[new_row, new_col]:
+                continue
+            is_revealed[new_row, new_col] = 1
+            stack[top] = new_row * width + new_col
+            top += 1
+            revealed += 1
+
+    return revealed
+
+
+# Prefer the ahead-of-time build (see src/cascade_aot.py), then Numba's JIT,
+# then pure Python; all variants share the same signature
+try:
+    from src._cascade_aot import reveal_cascade
+except ImportError:
+    reveal_cascade = njit(cache=True)(_reveal_cascade_kernel) if njit is not None else reveal_cascade_py
@@ -0,0 +1,30 @@
+"""Ahead-of-time build of the cascade reveal.
+
+Run ``python -m src.cascade_aot`` to compile ``src/_cascade_aot`` as a native
+extension module. When it is present, ``src.cascade`` uses it instead of
+JIT-compiling on the first reveal in each worker process.
+
+The build is optional: ``numba.pycc`` is deprecated and will be removed from
+Numba, and without it the cascade is JIT-compiled as before.
+"""
+import os
+import sys
+try:
+    from numba.pycc import CC
+except ImportError:
+    sys.exit("numba.pycc is not available in this Numba release, skipping the ahead-of-time build")
+from src.cascade import _reveal_cascade_kernel
+
+cc = CC('_cascade_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Board planes are C-contiguous; is_mine and neighbor_mines may be read-only
+cc.export(
+    'reveal_cascade',
+    'i4(u1[:, ::1], Array(u1, 2, "C", readonly=True), u1[:, ::1], '
+    'Array(i1, 2, "C", readonly=True), i8, i8, i8, i8, i4[::1])'
+)(_reveal_cascade_kernel)
+
+
+if __name__ == "__main__":
+    cc.compile()
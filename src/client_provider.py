@@ -1,8 +1,10 @@
+import functools
 import os
 import pathlib
 import platform
 from temporalio.client import Client, TLSConfig
 from temporalio.envconfig import ClientConfig
+from src.converter import numpy_data_converter
 
 
 # Configures and returns a Temporal Client. This uses the default
@@ -16,16 +18,19 @@ async def get_temporal_client() -> Client:
             profile=profile_name,
             config_file=str(config_file_path),
         )
-        return await Client.connect(**connect_config)
+        return await Client.connect(**connect_config, data_converter=numpy_data_converter)
     else:
         return await Client.connect(
             os.getenv("TEMPORAL_ADDRESS", "localhost:7233"),
             namespace=os.getenv("TEMPORAL_NAMESPACE", "default"),
+            data_converter=numpy_data_converter,
         )
 
 
 # Returns the path representing the default location of the
-# configuration file, based on the current operating system.
+# configuration file, based on the current operating system. The result
+# is cached since it only depends on the platform and environment.
+@functools.lru_cache(maxsize=1)
 def get_config_file_path() -> pathlib.Path:
     home = pathlib.Path.home()
     system = platform.system()
@@ -0,0 +1,86 @@
+"""Temporal data converter with NumPy array support."""
+import base64
+import dataclasses
+import inspect
+from enum import Enum
+from typing import Any
+import numpy as np
+from temporalio.converter import (
+    AdvancedJSONEncoder,
+    CompositePayloadConverter,
+    DataConverter,
+    DefaultPayloadConverter,
+    JSONPlainPayloadConverter,
+    JSONTypeConverter,
+)
+
+
+class NumpyJSONEncoder(AdvancedJSONEncoder):
+    """JSON encoder that writes NumPy arrays as dtype, shape and raw bytes.
+
+    uint8 arrays holding only 0/1 (the board's boolean planes) are bit-packed,
+    eight cells per byte.
+    """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, np.ndarray):
+            packed = o.dtype == np.uint8 and not (o > 1).any()
+            data = np.packbits(o) if packed else np.ascontiguousarray(o)
+            return {
+                'dtype': o.dtype.str,
+                'shape': list(o.shape),
+                'packed': packed,
+                'data': base64.b64encode(data.tobytes()).decode('ascii'),
+            }
+        if isinstance(o, np.generic):
+            return o.item()
+        return super().default(o)
+
+
+class NumpyJSONTypeConverter(JSONTypeConverter):
+    """Rebuild NumPy arrays for fields type-hinted as ``np.ndarray``."""
+
+    def to_typed_value(self, hint: type, value: Any) -> Any:
+        if hint is not np.ndarray:
+            return JSONTypeConverter.Unhandled
+        data = base64.b64decode(value['data'])
+        if value.get('packed'):
+            bits = np.frombuffer(data, dtype=np.uint8)
+            return np.unpackbits(bits, count=int(np.prod(value['shape']))).reshape(value['shape'])
+        # bytearray keeps the decoded array writable
+        return np.frombuffer(bytearray(data), dtype=np.dtype(value['dtype'])).reshape(value['shape'])
+
+
+class EnumJSONTypeConverter(JSONTypeConverter):
+    """Rebuild Enum members from their value.
+
+    The stock converter only knows IntEnum/StrEnum and decodes ``(str, Enum)``
+    members such as GameStatus as a list of characters.
+    """
+
+    def to_typed_value(self, hint: type, value: Any) -> Any:
+        if not (inspect.isclass(hint) and issubclass(hint, Enum)):
+            return JSONTypeConverter.Unhandled
+        return hint(value)
+
+
+class NumpyPayloadConverter(CompositePayloadConverter):
+    """Default payload converter with the JSON converter swapped for NumPy support."""
+
+    def __init__(self) -> None:
+        json_converter = JSONPlainPayloadConverter(
+            encoder=NumpyJSONEncoder,
+            custom_type_converters=[NumpyJSONTypeConverter(), EnumJSONTypeConverter()],
+        )
+        super().__init__(
+            *(
+                json_converter if isinstance(c, JSONPlainPayloadConverter) else c
+                for c in DefaultPayloadConverter.default_encoding_payload_converters
+            )
+        )
+
+
+numpy_data_converter = dataclasses.replace(
+    DataConverter.default,
+    payload_converter_class=NumpyPayloadConverter,
+)
@@ -2,14 +2,17 @@
 import asyncio
 import os
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from temporalio.client import Client
+import orjson
 import uuid
 
 from src.workflows import MinesweeperWorkflow
-from src.types import GameConfig, MoveRequest
+from src.types import GameConfig, GameState, MoveAction, MoveRequest
 from src.client_provider import get_temporal_client
 
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +24,18 @@ CORS(app)
 # Global client reference
 temporal_client: Client | None = None
 
+# Long-lived event loop shared by all requests, run on a background thread
+event_loop: asyncio.AbstractEventLoop | None = None
+
+# Latest full state of recently used games, kept current by applying move results.
+# Only touched from coroutines on event_loop, which also encode each response, so
+# request threads never see a cached state and no locking is needed.
+GAME_CACHE_SIZE = 1024
+game_states: OrderedDict[str, GameState] = OrderedDict()
+
+# Move actions by their API name
+MOVE_ACTIONS = {action.name.lower(): action for action in MoveAction}
+
 
 def serialize_datetime(obj):
     """Helper to serialize datetime objects."""
@@ -29,80 +44,118 @@ def serialize_datetime(obj):
     return obj
 
 
-def serialize_game_state(game_state):
-    """Convert game state to JSON-serializable format."""
+def cells_to_json(board):
+    """Convert the board's cell arrays to a nested list of cell dictionaries."""
+    # Bulk-convert each array to nested Python lists once, then zip them per row
+    is_mine = board.is_mine.astype(bool).tolist()
+    is_revealed = board.is_revealed.astype(bool).tolist()
+    is_flagged = board.is_flagged.astype(bool).tolist()
+    neighbor_mines = board.neighbor_mines.tolist()
+    return [
+        [
+            {
+                'isMine': mine,
+                'isRevealed': revealed,
+                'isFlagged': flagged,
+                'neighborMines': count,
+                'row': row,
+                'col': col
+            }
+            for col, (mine, revealed, flagged, count) in enumerate(
+                zip(is_mine[row], is_revealed[row], is_flagged[row], neighbor_mines[row]))
+        ]
+        for row in range(board.height)
+    ]
+
+
+def columns_to_json(board):
+    """Return the board's cell arrays for columnar output.
+
+    The arrays are passed through as-is; encode_game_state encodes them natively.
+    """
+    return {
+        'isMine': board.is_mine,
+        'isRevealed': board.is_revealed,
+        'isFlagged': board.is_flagged,
+        'neighborMines': board.neighbor_mines
+    }
+
+
+def serialize_game_state(game_state, columnar=False):
+    """Convert game state to JSON-serializable format.
+
+    With ``columnar`` the board is sent as one nested list per cell attribute
+    (``board.isMine[row][col]``) instead of a dict per cell.
+    """
     if not game_state:
         return None
 
-    # Handle both dict and object access
-    def get_attr(obj, key):
-        """Get attribute from either dict or object."""
-        if isinstance(obj, dict):
-            return obj.get(key)
-        return getattr(obj, key, None)
-
-    # Convert cells to dictionaries
-    cells = []
-    board = get_attr(game_state, 'board')
-    if board:
-        board_cells = get_attr(board, 'cells')
-        if board_cells:
-            for row in board_cells:
-                row_cells = []
-                for cell in row:
-                    row_cells.append({
-                        'isMine': get_attr(cell, 'is_mine'),
-                        'isRevealed': get_attr(cell, 'is_revealed'),
-                        'isFlagged': get_attr(cell, 'is_flagged'),
-                        'neighborMines': get_attr(cell, 'neighbor_mines'),
-                        'row': get_attr(cell, 'row'),
-                        'col': get_attr(cell, 'col')
-                    })
-                cells.append(row_cells)
-
-    status = get_attr(game_state, 'status')
-    start_time = get_attr(game_state, 'start_time')
-    end_time = get_attr(game_state, 'end_time')
-
-    # Ensure status is always a string - be very explicit
-    logger.debug(f"Raw status before conversion: {repr(status)} (type: {type(status)})")
-
-    if isinstance(status, (list, tuple)):
-        # If it's a list/tuple, join it
-        status_str = ''.join(str(c) for c in status).upper()
-        logger.warning(f"Status was a list/tuple: {status}, converted to: {status_str}")
-    elif hasattr(status, 'value'):
-        status_str = str(status.value).upper()
-    elif hasattr(status, 'name'):
-        status_str = str(status.name).upper()
-    elif isinstance(status, str):
-        status_str = status.upper()
+    # Typed query/update results always decode to GameState objects
+    board = game_state.board
+    if columnar:
+        board_data = columns_to_json(board) if board else {}
     else:
-        status_str = str(status).upper() if status else 'NOT_STARTED'
-
-    logger.info(f"Final status: {status_str}")
+        board_data = {'cells': cells_to_json(board) if board else []}
 
     return {
-        'id': get_attr(game_state, 'id'),
+        'id': game_state.id,
         'board': {
-            'cells': cells,
-            'width': get_attr(board, 'width') if board else 0,
-            'height': get_attr(board, 'height') if board else 0,
-            'mineCount': get_attr(board, 'mine_count') if board else 0
+            **board_data,
+            'width': board.width if board else 0,
+            'height': board.height if board else 0,
+            'mineCount': board.mine_count if board else 0
         },
-        'status': status_str,
-        'startTime': start_time.isoformat() if isinstance(start_time, datetime) else start_time,
-        'endTime': end_time.isoformat() if isinstance(end_time, datetime) else end_time,
-        'flagsUsed': get_attr(game_state, 'flags_used'),
-        'cellsRevealed': get_attr(game_state, 'cells_revealed')
+        # GameStatus is a str Enum, so its value is already the canonical string
+        'status': game_state.status.value,
+        'startTime': serialize_datetime(game_state.start_time),
+        'endTime': serialize_datetime(game_state.end_time),
+        'flagsUsed': game_state.flags_used,
+        'cellsRevealed': game_state.cells_revealed
     }
 
 
-async def query_with_retry(handle, query_name, max_retries=5):
+def encode_game_state(game_state, columnar=False):
+    """Encode a game state response body with orjson, including any NumPy arrays it contains."""
+    return orjson.dumps({'gameState': serialize_game_state(game_state, columnar)}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_response(body):
+    """Wrap an encoded JSON body in a response."""
+    return Response(body, mimetype='application/json')
+
+
+def is_columnar_request():
+    """Whether the client asked for the columnar board format (``?format=columnar``)."""
+    return request.args.get('format') == 'columnar'
+
+
+def start_event_loop():
+    """Start the shared event loop on a daemon thread."""
+    global event_loop
+    event_loop = asyncio.new_event_loop()
+    threading.Thread(target=event_loop.run_forever, daemon=True).start()
+
+
+def run_coro(coro):
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, event_loop).result()
+
+
+def cache_game_state(game_state):
+    """Remember a game's full state, evicting the least recently used game."""
+    if not game_state or not game_state.board:
+        return
+    game_states[game_state.id] = game_state
+    game_states.move_to_end(game_state.id)
+    if len(game_states) > GAME_CACHE_SIZE:
+        game_states.popitem(last=False)
+
+
+async def query_with_retry(handle, query, *args, max_retries=5):
     """Query with retry logic for workflow initialization."""
     for i in range(max_retries):
         try:
-            return await handle.query(query_name)
+            return await handle.query(query, *args)
         except Exception as error:
             if i < max_retries - 1:
                 logger.info(f"Query not ready yet, retrying in {(i + 1) * 100}ms...")
@@ -125,30 +178,34 @@ def create_game():
         config = GameConfig(
             width=config_data['width'],
             height=config_data['height'],
-            mine_count=config_data['mineCount']
+            mine_count=config_data['mineCount'],
+            seed=config_data.get('seed')
         )
+        if not config.has_valid_seed():
+            return jsonify({'error': 'Seed must be a non-negative integer'}), 400
 
         if config.mine_count >= config.width * config.height:
             return jsonify({'error': 'Too many mines for the board size'}), 400
 
         game_id = str(uuid.uuid4())
 
+        columnar = is_columnar_request()
+
         # Start the workflow
         async def start_workflow():
-            await temporal_client.start_workflow(
+            handle = await temporal_client.start_workflow(
                 MinesweeperWorkflow.run,
                 args=[game_id, config],
                 id=game_id,
                 task_queue="minesweeper-task-queue"
             )
 
-            # Get initial game state with retry
-            handle = temporal_client.get_workflow_handle(game_id)
-            game_state = await query_with_retry(handle, "get_game_state_query")
-            return game_state
+            # Blocks until the workflow has created the board, no polling needed
+            game_state = await handle.execute_update(MinesweeperWorkflow.init_and_get_state_update)
+            cache_game_state(game_state)
+            return encode_game_state(game_state, columnar)
 
-        game_state = asyncio.run(start_workflow())
-        return jsonify({'gameState': serialize_game_state(game_state)})
+        return json_response(run_coro(start_workflow()))
 
     except Exception as error:
         logger.error(f"Error creating game: {error}")
@@ -159,13 +216,21 @@ def create_game():
 def get_game_state(game_id):
     """Get game state."""
     try:
+        columnar = is_columnar_request()
+
         async def query_game():
             handle = temporal_client.get_workflow_handle(game_id)
-            game_state = await query_with_retry(handle, "get_game_state_query")
-            return game_state
+            cached = game_states.get(game_id)
+            # The workflow only sends the state back if it changed since the cached version
+            game_state = await query_with_retry(
+                handle, MinesweeperWorkflow.get_game_state_query, cached.version if cached else None
+            )
+            if game_state is None:
+                game_state = cached
+            cache_game_state(game_state)
+            return encode_game_state(game_state, columnar)
 
-        game_state = asyncio.run(query_game())
-        return jsonify({'gameState': serialize_game_state(game_state)})
+        return json_response(run_coro(query_game()))
 
     except Exception as error:
         logger.error(f"Error getting game state: {error}")
@@ -181,27 +246,35 @@ def make_move(game_id):
         # Validate move request
         if not isinstance(data.get('row'), int) or \
            not isinstance(data.get('col'), int) or \
-           data.get('action') not in ['reveal', 'flag', 'unflag', 'chord']:
+           data.get('action') not in MOVE_ACTIONS:
             return jsonify({'error': 'Invalid move request'}), 400
 
         move_request = MoveRequest(
             row=data['row'],
             col=data['col'],
-            action=data['action']
+            action=MOVE_ACTIONS[data['action']]
         )
+        columnar = is_columnar_request()
 
         async def execute_move():
             handle = temporal_client.get_workflow_handle(game_id)
-            # Execute move update and get the updated state directly
-            game_state = await handle.execute_update(
-                "make_move_update",
+            # Execute move update; it only returns the changes the move made
+            result = await handle.execute_update(
+                MinesweeperWorkflow.make_move_update,
                 move_request
             )
-            return game_state
 
-        game_state = asyncio.run(execute_move())
-        serialized = serialize_game_state(game_state)
-        return jsonify({'gameState': serialized})
+            game_state = game_states.get(game_id)
+            if game_state is not None and game_state.version == result.base_version:
+                game_state.apply_move_result(result)
+            else:
+                # Not cached (e.g. after a server restart) or the cache missed a change,
+                # such as a move made through another server; fetch the full state
+                game_state = await query_with_retry(handle, MinesweeperWorkflow.get_game_state_query)
+            cache_game_state(game_state)
+            return encode_game_state(game_state, columnar)
+
+        return json_response(run_coro(execute_move()))
 
     except Exception as error:
         logger.error(f"Error making move: {error}")
@@ -222,20 +295,24 @@ def restart_game(game_id):
         config = GameConfig(
             width=config_data['width'],
             height=config_data['height'],
-            mine_count=config_data['mineCount']
+            mine_count=config_data['mineCount'],
+            seed=config_data.get('seed')
         )
+        if not config.has_valid_seed():
+            return jsonify({'error': 'Seed must be a non-negative integer'}), 400
+        columnar = is_columnar_request()
 
         async def execute_restart():
             handle = temporal_client.get_workflow_handle(game_id)
             # Execute restart update and get the updated state directly
             game_state = await handle.execute_update(
-                "restart_game_update",
+                MinesweeperWorkflow.restart_game_update,
                 config
             )
-            return game_state
+            cache_game_state(game_state)
+            return encode_game_state(game_state, columnar)
 
-        game_state = asyncio.run(execute_restart())
-        return jsonify({'gameState': serialize_game_state(game_state)})
+        return json_response(run_coro(execute_restart()))
 
     except Exception as error:
         logger.error(f"Error restarting game: {error}")
@@ -273,8 +350,9 @@ async def initialize_client():
 def main():
     """Start the Flask server."""
     try:
-        # Initialize Temporal client
-        asyncio.run(initialize_client())
+        # Initialize Temporal client on the shared event loop
+        start_event_loop()
+        run_coro(initialize_client())
 
         port = int(os.getenv("PORT", 3000))
         logger.info(f"Minesweeper server running on http://localhost:{port}")
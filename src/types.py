@@ -1,13 +1,14 @@
 """Type definitions for Temporal Minesweeper."""
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
+import numpy as np
 
 
 @dataclass
 class Cell:
-    """Represents a single cell on the minesweeper board."""
+    """Read-only view of a single cell on the minesweeper board."""
     is_mine: bool
     is_revealed: bool
     is_flagged: bool
@@ -18,12 +19,29 @@ class Cell:
 
 @dataclass
 class GameBoard:
-    """Represents the game board."""
-    cells: List[List[Cell]]
+    """Represents the game board.
+
+    Cell state is stored as parallel arrays of shape ``(height, width)``.
+    """
+    is_mine: np.ndarray  # uint8
+    is_revealed: np.ndarray  # uint8
+    is_flagged: np.ndarray  # uint8
+    neighbor_mines: np.ndarray  # int8
     width: int
     height: int
     mine_count: int
 
+    def cell(self, row: int, col: int) -> Cell:
+        """Return a view of the cell at the given position."""
+        return Cell(
+            is_mine=bool(self.is_mine[row, col]),
+            is_revealed=bool(self.is_revealed[row, col]),
+            is_flagged=bool(self.is_flagged[row, col]),
+            neighbor_mines=int(self.neighbor_mines[row, col]),
+            row=row,
+            col=col
+        )
+
 
 class GameStatus(str, Enum):
     """Possible game states."""
@@ -38,12 +56,57 @@ class GameStatus(str, Enum):
 class GameState:
     """Current state of the game."""
     id: str
-    board: GameBoard
+    board: Optional[GameBoard]  # None until the workflow has created the board
     status: GameStatus
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     flags_used: int = 0
     cells_revealed: int = 0
+    version: int = 0  # Bumped by the workflow on every change
+
+    def move_batch(self, moves: List['MoveRequest']) -> 'MoveBatch':
+        """Package moves with the parts of this state needed to apply them."""
+        return MoveBatch(
+            is_mine=self.board.is_mine,
+            is_revealed=self.board.is_revealed,
+            is_flagged=self.board.is_flagged,
+            neighbor_mines=self.board.neighbor_mines,
+            mine_count=self.board.mine_count,
+            status=self.status,
+            flags_used=self.flags_used,
+            cells_revealed=self.cells_revealed,
+            moves=moves,
+            start_time=self.start_time
+        )
+
+    def apply_move_result(self, result: 'MoveResult') -> None:
+        """Apply the changes described by a move result to this state in place.
+
+        Only valid when this state is at ``result.base_version``.
+        """
+        if result.revealed:
+            rows, cols = zip(*result.revealed)
+            self.board.is_revealed[list(rows), list(cols)] = 1
+        if result.flagged:
+            rows, cols = zip(*result.flagged)
+            self.board.is_flagged[list(rows), list(cols)] = 1
+        if result.unflagged:
+            rows, cols = zip(*result.unflagged)
+            self.board.is_flagged[list(rows), list(cols)] = 0
+        self.status = result.status
+        self.start_time = result.start_time
+        self.end_time = result.end_time
+        self.flags_used = result.flags_used
+        self.cells_revealed = result.cells_revealed
+        self.version = result.version
+
+
+class MoveAction(IntEnum):
+    """Possible move actions."""
+    REVEAL = 0
+    FLAG = 1
+    UNFLAG = 2
+    CHORD = 3
 
 
 @dataclass
@@ -51,7 +114,37 @@ class MoveRequest:
     """Request to make a move."""
     row: int
     col: int
-    action: str  # 'reveal', 'flag', 'unflag', 'chord'
+    action: MoveAction
+
+
+@dataclass
+class MoveResult:
+    """Changes made to the game state by a move or a batch of moves."""
+    revealed: List[Tuple[int, int]]  # Newly revealed (row, col) cells
+    flagged: List[Tuple[int, int]]  # Newly flagged cells
+    unflagged: List[Tuple[int, int]]  # Cells whose flag was removed
+    status: GameStatus
+    cells_revealed: int
+    flags_used: int
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    base_version: int = 0  # Version of the game state the changes were made to
+    version: int = 0  # Version of the game state after the changes
+
+
+@dataclass
+class MoveBatch:
+    """Moves to apply together, with the game state they need."""
+    is_mine: np.ndarray  # uint8
+    is_revealed: np.ndarray  # uint8
+    is_flagged: np.ndarray  # uint8
+    neighbor_mines: np.ndarray  # int8, as computed when the board was created
+    mine_count: int
+    status: GameStatus
+    flags_used: int
+    cells_revealed: int
+    moves: List[MoveRequest]
+    start_time: Optional[datetime] = None
 
 
 @dataclass
@@ -60,6 +153,13 @@ class GameConfig:
     width: int
     height: int
     mine_count: int
+    seed: Optional[int] = None  # Seed for mine placement; same seed gives the same board
+
+    def has_valid_seed(self) -> bool:
+        """Whether the seed is absent or a non-negative integer, the only seeds NumPy accepts."""
+        if self.seed is None:
+            return True
+        return isinstance(self.seed, int) and not isinstance(self.seed, bool) and self.seed >= 0
 
 
 @dataclass
@@ -2,6 +2,7 @@
 import asyncio
 import logging
 from temporalio.worker import Worker
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
 from src.workflows import MinesweeperWorkflow
 from src import activities
 from src.client_provider import get_temporal_client
@@ -20,11 +21,13 @@ async def main():
         client,
         task_queue="minesweeper-task-queue",
         workflows=[MinesweeperWorkflow],
+        # Game state carries NumPy arrays; let the sandbox share the real module
+        workflow_runner=SandboxedWorkflowRunner(
+            restrictions=SandboxRestrictions.default.with_passthrough_modules("numpy"),
+        ),
         activities=[
             activities.create_game_board,
-            activities.reveal_cell,
-            activities.toggle_flag,
-            activities.chord_reveal,
+            activities.apply_moves_batch,
         ],
     )
 
@@ -1,12 +1,68 @@
 """Temporal workflows for Minesweeper game."""
 import asyncio
+import dataclasses
 from datetime import datetime, timedelta
+from typing import Optional
 from temporalio import workflow
 from temporalio.common import RetryPolicy
 
 with workflow.unsafe.imports_passed_through():
-    from src.types import GameState, GameStatus, MoveRequest, GameConfig
-    from src.activities import create_game_board, reveal_cell, toggle_flag, chord_reveal
+    from src.types import GameBoard, GameState, GameStatus, MoveAction, MoveRequest, MoveResult, GameConfig
+    from src.cascade import NEIGHBOR_OFFSETS
+    from src.activities import create_game_board, apply_moves_batch, unchanged_move_result
+
+
+# Retry transient failures a few times; invalid input fails the same way on every attempt
+_RETRY_POLICY = RetryPolicy(
+    initial_interval=timedelta(milliseconds=100),
+    maximum_attempts=3,
+    non_retryable_error_types=['ValueError', 'InvalidMoveError'],
+)
+
+# Options shared by every call of each activity.
+# Moves are short CPU-bound work, so they run as local activities on the workflow's worker
+_BOARD_ACTIVITY_OPTIONS = dict(start_to_close_timeout=timedelta(seconds=60), retry_policy=_RETRY_POLICY)
+_MOVE_ACTIVITY_OPTIONS = dict(start_to_close_timeout=timedelta(seconds=5), retry_policy=_RETRY_POLICY)
+
+# Games close automatically after this many seconds without moves or restarts
+_INACTIVITY_SECONDS = 24 * 60 * 60.0
+
+# Statuses of games that no longer accept moves
+_TERMINAL_STATUSES = frozenset({GameStatus.WON, GameStatus.LOST, GameStatus.CLOSED})
+
+# Moves and restarts handled in one run before continuing as new to keep the history short
+_CONTINUE_AS_NEW_EVENTS = 500
+
+# Number of seeded boards kept for restarts with the same configuration
+_BOARD_CACHE_SIZE = 4
+
+
+def _move_would_change_state(state: GameState, move: MoveRequest) -> bool:
+    """Whether a move can change the game state as it is now.
+
+    False for cells off the board.
+    """
+    board = state.board
+    row, col = move.row, move.col
+    if not (0 <= row < board.height and 0 <= col < board.width):
+        return False
+    if board.is_revealed[row, col]:
+        if move.action != MoveAction.CHORD or board.neighbor_mines[row, col] == 0:
+            return False
+        # Chording needs as many flagged neighbors as the cell's number, and a neighbor left to open
+        flagged_count = 0
+        has_hidden = False
+        for dr, dc in NEIGHBOR_OFFSETS:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < board.height and 0 <= new_col < board.width:
+                if board.is_flagged[new_row, new_col]:
+                    flagged_count += 1
+                elif not board.is_revealed[new_row, new_col]:
+                    has_hidden = True
+        return has_hidden and flagged_count == board.neighbor_mines[row, col]
+    if move.action == MoveAction.REVEAL:
+        return not board.is_flagged[row, col]
+    return move.action != MoveAction.CHORD  # Flags toggle on any hidden cell
 
 
 @workflow.defn
@@ -16,182 +72,282 @@ class MinesweeperWorkflow:
     def __init__(self):
         self.game_id: str = ""
         self.game_state: GameState | None = None
-        self.last_activity_time: float = 0
-        self.should_close: bool = False
+        # Workflow time at which the game closes for inactivity
+        self._deadline: float = 0
+        self._close_event = asyncio.Event()
+        # Set once game_state holds a board
+        self._ready_event = asyncio.Event()
+        # Moves waiting for the move worker, each with the future awaiting its result
+        self._move_queue: asyncio.Queue[tuple[MoveRequest, asyncio.Future]] = asyncio.Queue()
+        self._applying_moves: bool = False
+        # Moves and restarts handled in this run, and whether the history has grown enough to continue as new
+        self._events_handled: int = 0
+        self._continue_as_new_event = asyncio.Event()
+        # Fresh boards of client-seeded configs, keyed by (width, height, mine_count, seed)
+        self._board_cache: dict[tuple, GameBoard] = {}
 
     @workflow.run
-    async def run(self, game_id: str, initial_config: GameConfig) -> None:
-        """Main workflow entry point."""
+    async def run(self, game_id: str, initial_config: GameConfig,
+                  resume_state: Optional[GameState] = None, resume_deadline: Optional[float] = None) -> None:
+        """Main workflow entry point.
+
+        ``resume_state`` and ``resume_deadline`` carry a game over from a run
+        that continued as new.
+        """
         # Store game_id immediately so queries can access it during initialization
         self.game_id = game_id
 
-        # Set initial activity time
-        self.last_activity_time = workflow.time()
+        if resume_state is not None:
+            self.game_state = resume_state
+            self._deadline = resume_deadline
+        else:
+            # Start the inactivity deadline
+            self._touch()
 
-        # Create initial board
-        initial_board = await workflow.execute_activity(
-            create_game_board,
-            initial_config,
-            start_to_close_timeout=timedelta(seconds=60),
-        )
+            # Create initial board
+            initial_board = await self._new_board(initial_config)
 
-        self.game_state = GameState(
-            id=game_id,
-            board=initial_board,
-            status=GameStatus.NOT_STARTED,
-            flags_used=0,
-            cells_revealed=0
-        )
+            self.game_state = GameState(
+                id=game_id,
+                board=initial_board,
+                status=GameStatus.NOT_STARTED,
+                flags_used=0,
+                cells_revealed=0
+            )
+        self._ready_event.set()
 
-        # Auto-close workflow after 24 hours of inactivity
-        inactivity_timeout = timedelta(hours=24)
-        check_interval = timedelta(minutes=1)
+        move_worker = asyncio.create_task(self._move_worker())
 
+        # Auto-close workflow after 24 hours of inactivity
+        close_task = asyncio.create_task(self._close_event.wait())
+        continue_task = asyncio.create_task(self._continue_as_new_event.wait())
         try:
-            while not self.should_close:
-                # Wait for either close signal or timeout
-                await workflow.wait_condition(
-                    lambda: self.should_close or
-                           (workflow.time() - self.last_activity_time) >= inactivity_timeout.total_seconds(),
-                    timeout=check_interval.total_seconds()
-                )
-
-                if self.should_close:
-                    break
-
-                # Check if we've reached the inactivity timeout
-                if (workflow.time() - self.last_activity_time) >= inactivity_timeout.total_seconds():
+            while not (close_task.done() or continue_task.done()):
+                # One timer up to the deadline; moves during the wait push the deadline back
+                remaining = self._deadline - workflow.time()
+                if remaining <= 0:
                     workflow.logger.info(f"Game {game_id} auto-closing due to 24 hours of inactivity")
                     break
-
+                timer_task = asyncio.create_task(asyncio.sleep(remaining))
+                await asyncio.wait([close_task, continue_task, timer_task], return_when=asyncio.FIRST_COMPLETED)
+                timer_task.cancel()
         except Exception as error:
             workflow.logger.error(f"Error in workflow loop: {error}")
+        finally:
+            close_task.cancel()
+            continue_task.cancel()
+
+        if self._continue_as_new_event.is_set() and not self._close_event.is_set():
+            # Let in-flight moves and restarts finish so none are lost, then carry the game over
+            await workflow.wait_condition(workflow.all_handlers_finished)
+            # A close that arrived during the wait still closes the game
+            if not self._close_event.is_set():
+                move_worker.cancel()
+                workflow.continue_as_new(args=[game_id, initial_config, self.game_state, self._deadline])
+
+        # Let moves queued before the close and in-flight restarts finish; handlers
+        # take no new work once closing, so this completes
+        self._close_event.set()
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        move_worker.cancel()
 
         # Mark the game as closed
         if self.game_state:
             self.game_state.status = GameStatus.CLOSED
-            self.game_state.end_time = datetime.utcfromtimestamp(workflow.time())
+            _, self.game_state.end_time = self._now_pair()
+            self.game_state.version += 1
 
         workflow.logger.info(f"Minesweeper workflow {game_id} completed")
 
-    @workflow.signal
-    async def make_move_signal(self, move_request: MoveRequest) -> None:
-        """Signal to make a move (fire-and-forget)."""
-        if not self.game_state or self.game_state.status in [GameStatus.WON, GameStatus.LOST, GameStatus.CLOSED]:
-            return  # Game not ready or game is over, ignore moves
-
-        # Update activity time
-        self.last_activity_time = workflow.time()
-
-        # Start the game on first move
+    def _now_pair(self) -> tuple[float, datetime]:
+        """Current workflow time as a timestamp and as a naive UTC datetime, from one reading."""
+        now = workflow.time()
+        return now, datetime.utcfromtimestamp(now)
+
+    def _touch(self, now: float | None = None) -> None:
+        """Push the inactivity deadline back to a full timeout from now."""
+        if now is None:
+            now = workflow.time()
+        self._deadline = now + _INACTIVITY_SECONDS
+
+    def _seed_config(self, config: GameConfig) -> GameConfig:
+        """Fill in a board seed from the workflow's deterministic RNG if none was given."""
+        if config.seed is not None:
+            return config
+        return dataclasses.replace(config, seed=workflow.random().getrandbits(32))
+
+    async def _new_board(self, config: GameConfig) -> GameBoard:
+        """Create a board for a config, reusing a cached one when the client gave a seed."""
+        if not config.has_valid_seed():
+            # The board activity rejects it, which would fail the run or restart, so draw one instead
+            workflow.logger.warning(f"Ignoring invalid board seed {config.seed!r}")
+            config = dataclasses.replace(config, seed=None)
+
+        # Unseeded configs get a fresh random seed, so only client-seeded boards repeat
+        if config.seed is None:
+            return await self._create_board(self._seed_config(config))
+
+        key = (config.width, config.height, config.mine_count, config.seed)
+        board = self._board_cache.get(key)
+        if board is None:
+            board = await self._create_board(config)
+            if len(self._board_cache) >= _BOARD_CACHE_SIZE:
+                del self._board_cache[next(iter(self._board_cache))]  # Evict the oldest
+            self._board_cache[key] = board
+
+        # Games mutate the revealed and flagged planes, so each gets its own copies
+        return dataclasses.replace(board, is_revealed=board.is_revealed.copy(), is_flagged=board.is_flagged.copy())
+
+    async def _create_board(self, config: GameConfig) -> GameBoard:
+        """Run the activity that creates a board."""
+        return await workflow.execute_activity(create_game_board, args=[config], **_BOARD_ACTIVITY_OPTIONS)
+
+    def _start_game(self, now: datetime) -> None:
+        """Move a game that has not started to in progress, as its first move does."""
         if self.game_state.status == GameStatus.NOT_STARTED:
             self.game_state.status = GameStatus.IN_PROGRESS
-            self.game_state.start_time = datetime.utcfromtimestamp(workflow.time())
+            self.game_state.start_time = now
+            self.game_state.version += 1
+
+    def _count_event(self) -> None:
+        """Count a move or restart, continuing as new once the run's history is long enough."""
+        self._events_handled += 1
+        if self._events_handled >= _CONTINUE_AS_NEW_EVENTS or workflow.info().is_continue_as_new_suggested():
+            self._continue_as_new_event.set()
+
+    def _queue_move(self, move_request: MoveRequest, result: asyncio.Future) -> None:
+        """Queue a move for the move worker, with the future for its batch's result."""
+        self._move_queue.put_nowait((move_request, result))
+
+    def _is_noop_move(self, move_request: MoveRequest) -> bool:
+        """Whether a move can be dropped without running it."""
+        board = self.game_state.board
+        if not (0 <= move_request.row < board.height and 0 <= move_request.col < board.width):
+            return True
+        # Queued and running moves may still change the board, so only a settled one can be checked
+        if not self._move_queue.empty() or self._applying_moves:
+            return False
+        return not _move_would_change_state(self.game_state, move_request)
+
+    def _drain_move_queue(self) -> list[tuple[MoveRequest, asyncio.Future]]:
+        """Take every move currently queued."""
+        items = []
+        while not self._move_queue.empty():
+            items.append(self._move_queue.get_nowait())
+        return items
+
+    async def _move_worker(self) -> None:
+        """Apply queued moves in order, in batches of one activity each."""
+        while True:
+            # Moves that arrive while a batch is running are collected into the next one
+            items = [await self._move_queue.get()] + self._drain_move_queue()
+            moves = [move for move, _ in items]
+
+            # Update activity time once per batch, and start the game on first move
+            now, now_datetime = self._now_pair()
+            self._touch(now)
+            game_state = self.game_state
+            base_version = game_state.version
+            self._start_game(now_datetime)
+
+            result = unchanged_move_result(game_state)
+            self._applying_moves = True
+            try:
+                if game_state.status == GameStatus.IN_PROGRESS:
+                    result = await workflow.execute_local_activity(
+                        apply_moves_batch, args=[game_state.move_batch(moves)], **_MOVE_ACTIVITY_OPTIONS
+                    )
+                    # The game may have been restarted while the batch was running
+                    if game_state is self.game_state:
+                        result.base_version = base_version
+                        result.version = game_state.version + 1
+                        game_state.apply_move_result(result)
+                    else:
+                        result = unchanged_move_result(self.game_state)
+            except Exception as error:
+                workflow.logger.error(f"Error processing moves: {error}")
+            finally:
+                self._applying_moves = False
+                # Also reached when the worker is cancelled as the workflow ends
+                for _, future in items:
+                    future.set_result(result)
+
+    async def _do_move(self, move_request: MoveRequest) -> MoveResult:
+        """Queue a move and return the changes made by the batch it ran in."""
+        if self._close_event.is_set() or self._continue_as_new_event.is_set():
+            # Closing or handing over to a new run, schedule no more work
+            return unchanged_move_result(self.game_state)
+
+        # Every move adds to the history, even one that changes nothing
+        self._count_event()
+
+        if self.game_state.status in _TERMINAL_STATUSES:
+            return unchanged_move_result(self.game_state)  # Nothing changes once the game is over
+
+        if self._is_noop_move(move_request):
+            # Still a move by the player: it keeps the game alive and starts it like any other
+            now, now_datetime = self._now_pair()
+            self._touch(now)
+            self._start_game(now_datetime)
+            return unchanged_move_result(self.game_state)
+
+        result = asyncio.get_running_loop().create_future()
+        self._queue_move(move_request, result)
+        return await result
 
-        row, col, action = move_request.row, move_request.col, move_request.action
+    @workflow.signal
+    async def make_move_signal(self, move_request: MoveRequest) -> None:
+        """Signal to make a move (fire-and-forget)."""
+        if not self.game_state:
+            return  # Game not ready, ignore moves
 
-        try:
-            if action == 'reveal':
-                self.game_state = await workflow.execute_activity(
-                    reveal_cell,
-                    args=[self.game_state, row, col],
-                    start_to_close_timeout=timedelta(seconds=60),
-                )
-            elif action in ['flag', 'unflag']:
-                self.game_state = await workflow.execute_activity(
-                    toggle_flag,
-                    args=[self.game_state, row, col],
-                    start_to_close_timeout=timedelta(seconds=60),
-                )
-            elif action == 'chord':
-                self.game_state = await workflow.execute_activity(
-                    chord_reveal,
-                    args=[self.game_state, row, col],
-                    start_to_close_timeout=timedelta(seconds=60),
-                )
-        except Exception as error:
-            workflow.logger.error(f"Error processing move: {error}")
+        await self._do_move(move_request)
 
     @workflow.update
-    async def make_move_update(self, move_request: MoveRequest) -> GameState:
-        """Update to make a move and return the updated state."""
+    async def make_move_update(self, move_request: MoveRequest) -> MoveResult:
+        """Update to make a move and return the changes made by the batch it ran in."""
         if not self.game_state:
             raise ValueError("Game state not initialized")
 
-        if self.game_state.status in [GameStatus.WON, GameStatus.LOST, GameStatus.CLOSED]:
-            return self.game_state  # Return current state if game is over
-
-        # Update activity time
-        self.last_activity_time = workflow.time()
-
-        # Start the game on first move
-        if self.game_state.status == GameStatus.NOT_STARTED:
-            self.game_state.status = GameStatus.IN_PROGRESS
-            self.game_state.start_time = datetime.utcfromtimestamp(workflow.time())
-
-        row, col, action = move_request.row, move_request.col, move_request.action
-
-        try:
-            if action == 'reveal':
-                self.game_state = await workflow.execute_activity(
-                    reveal_cell,
-                    args=[self.game_state, row, col],
-                    start_to_close_timeout=timedelta(seconds=60),
-                )
-            elif action in ['flag', 'unflag']:
-                self.game_state = await workflow.execute_activity(
-                    toggle_flag,
-                    args=[self.game_state, row, col],
-                    start_to_close_timeout=timedelta(seconds=60),
-                )
-            elif action == 'chord':
-                self.game_state = await workflow.execute_activity(
-                    chord_reveal,
-                    args=[self.game_state, row, col],
-                    start_to_close_timeout=timedelta(seconds=60),
-                )
-        except Exception as error:
-            workflow.logger.error(f"Error processing move: {error}")
-
-        return self.game_state
+        return await self._do_move(move_request)
 
     @workflow.signal
     async def restart_game_signal(self, config: GameConfig) -> None:
         """Signal to restart the game with new configuration."""
-        if self.game_state and self.game_state.status == GameStatus.CLOSED:
+        if self._close_event.is_set() or (self.game_state and self.game_state.status == GameStatus.CLOSED):
             return  # Cannot restart closed games
 
         # Update activity time
-        self.last_activity_time = workflow.time()
+        self._touch()
+        self._count_event()
 
-        new_board = await workflow.execute_activity(
-            create_game_board,
-            config,
-            start_to_close_timeout=timedelta(seconds=60),
-        )
+        new_board = await self._new_board(config)
+        if self._close_event.is_set():
+            return  # Closed while the board was being created
 
         self.game_state = GameState(
             id=self.game_state.id if self.game_state else "",
             board=new_board,
             status=GameStatus.NOT_STARTED,
             flags_used=0,
-            cells_revealed=0
+            cells_revealed=0,
+            version=self.game_state.version + 1 if self.game_state else 0
         )
+        self._ready_event.set()
 
     @workflow.update
     async def restart_game_update(self, config: GameConfig) -> GameState:
         """Update to restart the game and return the new state."""
-        if self.game_state and self.game_state.status == GameStatus.CLOSED:
+        if self._close_event.is_set() or (self.game_state and self.game_state.status == GameStatus.CLOSED):
             return self.game_state  # Cannot restart closed games
 
         # Update activity time
-        self.last_activity_time = workflow.time()
+        self._touch()
+        self._count_event()
 
-        new_board = await workflow.execute_activity(
-            create_game_board,
-            config,
-            start_to_close_timeout=timedelta(seconds=60),
-        )
+        new_board = await self._new_board(config)
+        if self._close_event.is_set():
+            return self.game_state  # Closed while the board was being created
 
         game_id = self.game_state.id if self.game_state else ""
         self.game_state = GameState(
@@ -199,24 +355,37 @@ class MinesweeperWorkflow:
             board=new_board,
             status=GameStatus.NOT_STARTED,
             flags_used=0,
-            cells_revealed=0
+            cells_revealed=0,
+            version=self.game_state.version + 1 if self.game_state else 0
         )
+        self._ready_event.set()
 
         return self.game_state
 
+    @workflow.update
+    async def init_and_get_state_update(self) -> GameState:
+        """Update that waits for the initial board to be created and returns the state."""
+        await self._ready_event.wait()
+        return self.game_state
+
     @workflow.signal
     def close_game_signal(self) -> None:
         """Signal to close the game."""
-        self.should_close = True
+        self._close_event.set()
 
     @workflow.query
-    def get_game_state_query(self) -> GameState:
-        """Query to get the current game state."""
+    def get_game_state_query(self, known_version: Optional[int] = None) -> Optional[GameState]:
+        """Query to get the current game state.
+
+        Returns None instead when the caller already has ``known_version``.
+        """
+        if self.game_state and self.game_state.version == known_version:
+            return None  # Caller's copy is current, skip sending the board
         if not self.game_state:
             # Return a minimal valid state while initializing
             return GameState(
                 id=self.game_id,
-                board=None,  # type: ignore
+                board=None,
                 status=GameStatus.NOT_STARTED,
                 flags_used=0,
                 cells_revealed=0
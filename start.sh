@@ -19,6 +19,11 @@ source venv/bin/activate
 echo "Installing dependencies..."
 pip install -r requirements.txt
 
+# Optionally precompile the cascade reveal; startup carries on with JIT compilation if
+# this fails, including on Numba releases without the deprecated numba.pycc
+echo "Compiling cascade module..."
+python -m src.cascade_aot || echo "⚠️  Ahead-of-time compilation skipped, using JIT instead"
+
 # Start the worker in the background
 echo "Starting Temporal worker..."
 python -m src.worker &
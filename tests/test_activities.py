@@ -0,0 +1,217 @@
+"""Tests for the game logic activities."""
+import unittest
+import numpy as np
+from src.activities import (
+    InvalidMoveError,
+    apply_moves_batch,
+    board_neighbor_mines,
+    clone_game_state,
+    count_neighbor_mines,
+    create_game_board,
+    move_result,
+    unchanged_move_result,
+)
+from src.types import GameBoard, GameConfig, GameState, GameStatus, MoveAction, MoveRequest
+
+# Mines fill the middle column, so revealing the left side stops at it:
+#   0 2 * 2
+#   0 3 * 3
+#   0 2 * 2
+WALL_MINES = [
+    [0, 0, 1, 0],
+    [0, 0, 1, 0],
+    [0, 0, 1, 0],
+]
+
+# Two corner mines, so any zero cell opens the whole safe board:
+#   * 1 0 0
+#   1 1 0 0
+#   0 0 1 1
+#   0 0 1 *
+CORNER_MINES = [
+    [1, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 1],
+]
+
+
+def make_state(mines, revealed=(), flagged=()) -> GameState:
+    """Build an in-progress game from a mine layout and the revealed and flagged cells."""
+    is_mine = np.array(mines, dtype=np.uint8)
+    height, width = is_mine.shape
+    board = GameBoard(
+        is_mine=is_mine,
+        is_revealed=np.zeros((height, width), dtype=np.uint8),
+        is_flagged=np.zeros((height, width), dtype=np.uint8),
+        neighbor_mines=board_neighbor_mines(is_mine),
+        width=width,
+        height=height,
+        mine_count=int(is_mine.sum())
+    )
+    for row, col in revealed:
+        board.is_revealed[row, col] = 1
+    for row, col in flagged:
+        board.is_flagged[row, col] = 1
+    return GameState(
+        id="game",
+        board=board,
+        status=GameStatus.IN_PROGRESS,
+        flags_used=len(flagged),
+        cells_revealed=len(revealed)
+    )
+
+
+def move(row: int, col: int, action: MoveAction) -> MoveRequest:
+    """Build a move request."""
+    return MoveRequest(row=row, col=col, action=action)
+
+
+class NeighborMinesTest(unittest.TestCase):
+    def test_counts_mines_around_each_cell(self):
+        counts = count_neighbor_mines(np.array(WALL_MINES, dtype=np.uint8))
+        np.testing.assert_array_equal(counts, [[0, 2, 1, 2], [0, 3, 2, 3], [0, 2, 1, 2]])
+
+    def test_board_counts_are_zero_on_mines_and_read_only(self):
+        counts = board_neighbor_mines(np.array(WALL_MINES, dtype=np.uint8))
+        np.testing.assert_array_equal(counts, [[0, 2, 0, 2], [0, 3, 0, 3], [0, 2, 0, 2]])
+        self.assertFalse(counts.flags.writeable)
+
+
+class CreateGameBoardTest(unittest.IsolatedAsyncioTestCase):
+    async def test_places_the_requested_mines(self):
+        board = await create_game_board(GameConfig(width=9, height=7, mine_count=10, seed=1))
+        self.assertEqual(board.is_mine.shape, (7, 9))
+        self.assertEqual(int(board.is_mine.sum()), 10)
+        self.assertFalse(board.is_revealed.any())
+        self.assertFalse(board.is_flagged.any())
+        np.testing.assert_array_equal(board.neighbor_mines, board_neighbor_mines(board.is_mine))
+
+    async def test_same_seed_gives_the_same_board(self):
+        config = GameConfig(width=9, height=9, mine_count=10, seed=42)
+        first = await create_game_board(config)
+        second = await create_game_board(config)
+        np.testing.assert_array_equal(first.is_mine, second.is_mine)
+
+    async def test_rejects_invalid_seeds(self):
+        for seed in (-1, "abc", 1.5, True):
+            with self.subTest(seed=seed), self.assertRaises(InvalidMoveError):
+                await create_game_board(GameConfig(width=9, height=9, mine_count=10, seed=seed))
+
+
+class ApplyMovesBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def apply(self, game_state: GameState, *moves: MoveRequest):
+        return await apply_moves_batch(game_state.move_batch(list(moves)))
+
+    async def test_reveal_cascades_up_to_numbered_cells(self):
+        result = await self.apply(make_state(WALL_MINES), move(0, 0, MoveAction.REVEAL))
+        self.assertEqual(sorted(result.revealed), [(row, col) for row in range(3) for col in range(2)])
+        self.assertEqual(result.cells_revealed, 6)
+        self.assertEqual(result.status, GameStatus.IN_PROGRESS)
+
+    async def test_reveal_numbered_cell_opens_only_it(self):
+        result = await self.apply(make_state(WALL_MINES), move(0, 3, MoveAction.REVEAL))
+        self.assertEqual(result.revealed, [(0, 3)])
+        self.assertEqual(result.cells_revealed, 1)
+
+    async def test_reveal_flagged_cell_does_nothing(self):
+        result = await self.apply(make_state(WALL_MINES, flagged=[(0, 3)]), move(0, 3, MoveAction.REVEAL))
+        self.assertEqual(result.revealed, [])
+        self.assertEqual(result.cells_revealed, 0)
+
+    async def test_reveal_mine_loses_and_shows_all_mines(self):
+        result = await self.apply(make_state(WALL_MINES), move(1, 2, MoveAction.REVEAL))
+        self.assertEqual(result.status, GameStatus.LOST)
+        self.assertEqual(sorted(result.revealed), [(0, 2), (1, 2), (2, 2)])
+        self.assertIsNotNone(result.end_time)
+
+    async def test_revealing_last_safe_cells_wins(self):
+        result = await self.apply(make_state(CORNER_MINES), move(0, 3, MoveAction.REVEAL))
+        self.assertEqual(result.status, GameStatus.WON)
+        self.assertEqual(result.cells_revealed, 14)
+        self.assertNotIn((0, 0), result.revealed)
+        self.assertIsNotNone(result.end_time)
+
+    async def test_flag_toggles(self):
+        result = await self.apply(make_state(WALL_MINES), move(0, 3, MoveAction.FLAG))
+        self.assertEqual(result.flagged, [(0, 3)])
+        self.assertEqual(result.flags_used, 1)
+
+        result = await self.apply(make_state(WALL_MINES, flagged=[(0, 3)]), move(0, 3, MoveAction.UNFLAG))
+        self.assertEqual(result.unflagged, [(0, 3)])
+        self.assertEqual(result.flags_used, 0)
+
+    async def test_flag_revealed_cell_does_nothing(self):
+        result = await self.apply(make_state(WALL_MINES, revealed=[(0, 3)]), move(0, 3, MoveAction.FLAG))
+        self.assertEqual(result.flagged, [])
+        self.assertEqual(result.flags_used, 0)
+
+    async def test_chord_opens_neighbors_when_flags_match(self):
+        game_state = make_state(WALL_MINES, revealed=[(0, 3)], flagged=[(0, 2), (1, 2)])
+        result = await self.apply(game_state, move(0, 3, MoveAction.CHORD))
+        self.assertEqual(result.revealed, [(1, 3)])
+        self.assertEqual(result.cells_revealed, 2)
+        self.assertEqual(result.status, GameStatus.IN_PROGRESS)
+
+    async def test_chord_with_too_few_flags_does_nothing(self):
+        game_state = make_state(WALL_MINES, revealed=[(0, 3)], flagged=[(0, 2)])
+        result = await self.apply(game_state, move(0, 3, MoveAction.CHORD))
+        self.assertEqual(result.revealed, [])
+
+    async def test_chord_with_a_wrong_flag_loses(self):
+        game_state = make_state(WALL_MINES, revealed=[(0, 3)], flagged=[(0, 2), (1, 3)])
+        result = await self.apply(game_state, move(0, 3, MoveAction.CHORD))
+        self.assertEqual(result.status, GameStatus.LOST)
+        self.assertIn((1, 2), result.revealed)
+
+    async def test_moves_apply_in_order_and_stop_when_the_game_ends(self):
+        result = await self.apply(
+            make_state(WALL_MINES),
+            move(0, 3, MoveAction.FLAG),
+            move(0, 3, MoveAction.UNFLAG),
+            move(1, 3, MoveAction.FLAG),
+            move(1, 2, MoveAction.REVEAL),
+            move(2, 3, MoveAction.FLAG),
+        )
+        self.assertEqual(result.status, GameStatus.LOST)
+        self.assertEqual(result.flagged, [(1, 3)])
+        self.assertEqual(result.unflagged, [])
+        self.assertEqual(result.flags_used, 1)
+
+    async def test_batch_planes_are_not_changed(self):
+        batch = make_state(WALL_MINES).move_batch([move(0, 0, MoveAction.REVEAL), move(0, 3, MoveAction.FLAG)])
+        await apply_moves_batch(batch)
+        self.assertFalse(batch.is_revealed.any())
+        self.assertFalse(batch.is_flagged.any())
+
+    async def test_off_board_move_is_invalid(self):
+        with self.assertRaises(InvalidMoveError):
+            await self.apply(make_state(WALL_MINES), move(3, 0, MoveAction.REVEAL))
+
+
+class MoveResultTest(unittest.TestCase):
+    def test_describes_the_changed_cells(self):
+        game_state = make_state(WALL_MINES, flagged=[(2, 3)])
+        new_game_state = clone_game_state(game_state)
+        new_game_state.board.is_revealed[0, 0] = 1
+        new_game_state.board.is_flagged[0, 3] = 1
+        new_game_state.board.is_flagged[2, 3] = 0
+        new_game_state.cells_revealed = 1
+
+        result = move_result(game_state, new_game_state)
+        self.assertEqual(result.revealed, [(0, 0)])
+        self.assertEqual(result.flagged, [(0, 3)])
+        self.assertEqual(result.unflagged, [(2, 3)])
+        self.assertEqual(result.cells_revealed, 1)
+        self.assertEqual(result.flags_used, 1)
+
+    def test_unchanged_result_keeps_the_version(self):
+        game_state = make_state(WALL_MINES)
+        game_state.version = 7
+        result = unchanged_move_result(game_state)
+        self.assertEqual((result.revealed, result.flagged, result.unflagged), ([], [], []))
+        self.assertEqual((result.base_version, result.version), (7, 7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the NumPy data converter."""
+import json
+import unittest
+from datetime import datetime
+import numpy as np
+from src.converter import numpy_data_converter
+from src.types import GameBoard, GameState, GameStatus, MoveAction, MoveBatch, MoveRequest
+
+payload_converter = numpy_data_converter.payload_converter
+
+
+def round_trip(value, hint):
+    """Encode a value to a payload and decode it back as ``hint``."""
+    payloads = payload_converter.to_payloads([value])
+    return payload_converter.from_payloads(payloads, [hint])[0]
+
+
+def encoded(value) -> dict:
+    """The JSON a value is encoded to."""
+    return json.loads(payload_converter.to_payloads([value])[0].data)
+
+
+class NumpyArrayTest(unittest.TestCase):
+    def test_boolean_planes_are_bit_packed(self):
+        # 15 cells do not fill the last byte, so unpacking must trim the padding
+        plane = (np.arange(15).reshape(3, 5) % 3 == 0).astype(np.uint8)
+        value = encoded(plane)
+        self.assertTrue(value['packed'])
+
+        decoded = round_trip(plane, np.ndarray)
+        self.assertEqual(decoded.dtype, np.uint8)
+        np.testing.assert_array_equal(decoded, plane)
+        self.assertTrue(decoded.flags.writeable)
+
+    def test_other_arrays_are_sent_as_raw_bytes(self):
+        counts = np.array([[0, 2, 8], [3, 1, 0]], dtype=np.int8)
+        self.assertFalse(encoded(counts)['packed'])
+        decoded = round_trip(counts, np.ndarray)
+        self.assertEqual(decoded.dtype, np.int8)
+        np.testing.assert_array_equal(decoded, counts)
+        self.assertTrue(decoded.flags.writeable)
+
+        wide = np.array([[0, 1, 2]], dtype=np.uint8)
+        self.assertFalse(encoded(wide)['packed'])
+        np.testing.assert_array_equal(round_trip(wide, np.ndarray), wide)
+
+
+class GameStateTest(unittest.TestCase):
+    def make_board(self) -> GameBoard:
+        is_mine = np.array([[1, 0, 0], [0, 0, 1]], dtype=np.uint8)
+        return GameBoard(
+            is_mine=is_mine,
+            is_revealed=np.array([[0, 1, 1], [0, 0, 0]], dtype=np.uint8),
+            is_flagged=np.array([[1, 0, 0], [0, 0, 0]], dtype=np.uint8),
+            neighbor_mines=np.array([[0, 1, 1], [1, 2, 0]], dtype=np.int8),
+            width=3,
+            height=2,
+            mine_count=2
+        )
+
+    def test_game_state_round_trip(self):
+        game_state = GameState(
+            id="game",
+            board=self.make_board(),
+            status=GameStatus.IN_PROGRESS,
+            start_time=datetime(2024, 1, 2, 3, 4, 5),
+            flags_used=1,
+            cells_revealed=2,
+            version=5
+        )
+        decoded = round_trip(game_state, GameState)
+        self.assertIs(decoded.status, GameStatus.IN_PROGRESS)
+        self.assertEqual(decoded.start_time, game_state.start_time)
+        self.assertEqual((decoded.flags_used, decoded.cells_revealed, decoded.version), (1, 2, 5))
+        for name in ('is_mine', 'is_revealed', 'is_flagged', 'neighbor_mines'):
+            np.testing.assert_array_equal(getattr(decoded.board, name), getattr(game_state.board, name))
+
+    def test_game_state_without_board(self):
+        decoded = round_trip(GameState(id="game", board=None, status=GameStatus.NOT_STARTED), GameState)
+        self.assertIsNone(decoded.board)
+        self.assertIs(decoded.status, GameStatus.NOT_STARTED)
+
+    def test_move_batch_round_trip(self):
+        game_state = GameState(id="game", board=self.make_board(), status=GameStatus.IN_PROGRESS)
+        decoded = round_trip(game_state.move_batch([MoveRequest(1, 1, MoveAction.CHORD)]), MoveBatch)
+        self.assertEqual(decoded.moves, [MoveRequest(1, 1, MoveAction.CHORD)])
+        self.assertIs(decoded.moves[0].action, MoveAction.CHORD)
+        np.testing.assert_array_equal(decoded.neighbor_mines, game_state.board.neighbor_mines)
+        self.assertEqual(decoded.neighbor_mines.dtype, np.int8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for the Flask server's move handling, with a fake Temporal client."""
+import unittest
+import numpy as np
+from src import server
+from src.types import GameBoard, GameState, GameStatus, MoveResult
+
+
+def make_state(version: int) -> GameState:
+    """A 2x2 game in progress with one mine in the corner."""
+    is_mine = np.array([[1, 0], [0, 0]], dtype=np.uint8)
+    return GameState(
+        id="game",
+        board=GameBoard(
+            is_mine=is_mine,
+            is_revealed=np.zeros((2, 2), dtype=np.uint8),
+            is_flagged=np.zeros((2, 2), dtype=np.uint8),
+            neighbor_mines=np.array([[0, 1], [1, 1]], dtype=np.int8),
+            width=2,
+            height=2,
+            mine_count=1
+        ),
+        status=GameStatus.IN_PROGRESS,
+        version=version
+    )
+
+
+class FakeHandle:
+    """Workflow handle that answers a move with a fixed result and queries with a fixed state."""
+
+    def __init__(self, result: MoveResult, game_state: GameState):
+        self.result = result
+        self.game_state = game_state
+        self.queries = 0
+
+    async def execute_update(self, update, *args, **kwargs):
+        return self.result
+
+    async def query(self, query, *args):
+        self.queries += 1
+        return self.game_state
+
+
+class FakeClient:
+    def __init__(self, handle: FakeHandle):
+        self.handle = handle
+
+    def get_workflow_handle(self, game_id):
+        return self.handle
+
+
+class MakeMoveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        server.start_event_loop()
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        server.game_states.clear()
+
+    def make_move(self, result: MoveResult, workflow_state: GameState) -> FakeHandle:
+        handle = FakeHandle(result, workflow_state)
+        server.temporal_client = FakeClient(handle)
+        response = self.client.post('/api/games/game/moves', json={'row': 1, 'col': 1, 'action': 'reveal'})
+        self.assertEqual(response.status_code, 200)
+        return handle
+
+    def reveal_result(self, base_version: int) -> MoveResult:
+        return MoveResult(
+            revealed=[(1, 1)], flagged=[], unflagged=[], status=GameStatus.IN_PROGRESS,
+            cells_revealed=1, flags_used=0, base_version=base_version, version=base_version + 1
+        )
+
+    def test_applies_result_to_cached_state_at_its_base_version(self):
+        server.cache_game_state(make_state(version=2))
+        handle = self.make_move(self.reveal_result(base_version=2), make_state(version=3))
+        self.assertEqual(handle.queries, 0)
+        cached = server.game_states["game"]
+        self.assertEqual(cached.version, 3)
+        self.assertEqual(cached.board.is_revealed[1, 1], 1)
+
+    def test_queries_when_cached_state_missed_a_change(self):
+        server.cache_game_state(make_state(version=1))
+        workflow_state = make_state(version=3)
+        handle = self.make_move(self.reveal_result(base_version=2), workflow_state)
+        self.assertEqual(handle.queries, 1)
+        self.assertIs(server.game_states["game"], workflow_state)
+
+    def test_queries_when_not_cached(self):
+        workflow_state = make_state(version=3)
+        handle = self.make_move(self.reveal_result(base_version=2), workflow_state)
+        self.assertEqual(handle.queries, 1)
+        self.assertIs(server.game_states["game"], workflow_state)
+
+
+class CreateGameTest(unittest.TestCase):
+    def test_rejects_invalid_seeds(self):
+        client = server.app.test_client()
+        for seed in (-1, "abc", 1.5, True):
+            with self.subTest(seed=seed):
+                response = client.post('/api/games', json={'config': {'width': 9, 'height': 9, 'mineCount': 10, 'seed': seed}})
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Tests for the game data types."""
+import unittest
+from datetime import datetime
+import numpy as np
+from src.types import GameBoard, GameConfig, GameState, GameStatus, MoveResult
+
+
+def make_state(version: int) -> GameState:
+    """A 2x3 game with no mines, nothing revealed and nothing flagged."""
+    return GameState(
+        id="game",
+        board=GameBoard(
+            is_mine=np.zeros((2, 3), dtype=np.uint8),
+            is_revealed=np.zeros((2, 3), dtype=np.uint8),
+            is_flagged=np.array([[0, 0, 1], [0, 0, 0]], dtype=np.uint8),
+            neighbor_mines=np.zeros((2, 3), dtype=np.int8),
+            width=3,
+            height=2,
+            mine_count=0
+        ),
+        status=GameStatus.IN_PROGRESS,
+        flags_used=1,
+        version=version
+    )
+
+
+class ApplyMoveResultTest(unittest.TestCase):
+    def test_applies_changes_and_moves_to_the_result_version(self):
+        game_state = make_state(version=3)
+        result = MoveResult(
+            revealed=[(0, 0), (1, 2)],
+            flagged=[(1, 0)],
+            unflagged=[(0, 2)],
+            status=GameStatus.WON,
+            cells_revealed=2,
+            flags_used=1,
+            start_time=datetime(2024, 1, 1),
+            end_time=datetime(2024, 1, 2),
+            base_version=3,
+            version=4
+        )
+        game_state.apply_move_result(result)
+
+        np.testing.assert_array_equal(game_state.board.is_revealed, [[1, 0, 0], [0, 0, 1]])
+        np.testing.assert_array_equal(game_state.board.is_flagged, [[0, 0, 0], [1, 0, 0]])
+        self.assertEqual(game_state.status, GameStatus.WON)
+        self.assertEqual((game_state.cells_revealed, game_state.flags_used), (2, 1))
+        self.assertEqual((game_state.start_time, game_state.end_time), (datetime(2024, 1, 1), datetime(2024, 1, 2)))
+        self.assertEqual(game_state.version, 4)
+
+    def test_empty_result_only_moves_the_version(self):
+        game_state = make_state(version=3)
+        result = MoveResult(
+            revealed=[], flagged=[], unflagged=[], status=GameStatus.IN_PROGRESS,
+            cells_revealed=0, flags_used=1, base_version=3, version=3
+        )
+        game_state.apply_move_result(result)
+        self.assertFalse(game_state.board.is_revealed.any())
+        np.testing.assert_array_equal(game_state.board.is_flagged, [[0, 0, 1], [0, 0, 0]])
+        self.assertEqual(game_state.version, 3)
+
+
+class GameConfigTest(unittest.TestCase):
+    def test_seed_validation(self):
+        for seed in (None, 0, 42, 2 ** 40):
+            with self.subTest(seed=seed):
+                self.assertTrue(GameConfig(width=9, height=9, mine_count=10, seed=seed).has_valid_seed())
+        for seed in (-1, "abc", 1.5, True):
+            with self.subTest(seed=seed):
+                self.assertFalse(GameConfig(width=9, height=9, mine_count=10, seed=seed).has_valid_seed())
+
+
+if __name__ == "__main__":
+    unittest.main()